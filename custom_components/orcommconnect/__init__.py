@@ -1,6 +1,9 @@
 """Orcomm Connect integration for Home Assistant."""
 import asyncio
+import json
 import logging
+import time
+from collections.abc import Callable
 from datetime import timedelta
 
 import aiohttp
@@ -13,15 +16,38 @@ from homeassistant.const import (
     CONF_USERNAME,
     Platform,
 )
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryError, ConfigEntryNotReady
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 
-from .const import DOMAIN, DEFAULT_SCAN_INTERVAL
+from .capture import CaptureSession, ReplaySession
+from .const import (
+    CONF_REPLAY_FILE,
+    CONF_REPLAY_SPEED,
+    DATA_SNAPSHOTS,
+    DOMAIN,
+    DEFAULT_REPLAY_SPEED,
+    DEFAULT_SCAN_INTERVAL,
+    PUSH_SAFETY_SCAN_INTERVAL,
+    STREAM_CHUNK_SIZE,
+    STREAM_MAX_ELEMENT_SIZE,
+    STREAM_THRESHOLD,
+    SWITCH_RETRIES,
+    SWITCH_RETRY_BACKOFF,
+)
+from .parser import DevicesStreamParser
+from .profiler import RefreshProfiler, write_results
+from .push import (
+    async_ensure_webhook_id,
+    async_register_push_webhook,
+    async_unregister_push_webhook,
+)
+from .services import async_setup_services, async_unload_services
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,6 +58,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Orcomm Connect from a config entry."""
     
     session = async_get_clientsession(hass)
+    if replay_file := entry.options.get(CONF_REPLAY_FILE):
+        # Serve recorded hub traffic instead of talking to the hub
+        try:
+            session = await ReplaySession.async_from_file(
+                hass,
+                hass.config.path(replay_file),
+                entry.options.get(CONF_REPLAY_SPEED, DEFAULT_REPLAY_SPEED),
+            )
+        except (OSError, ValueError) as err:
+            raise ConfigEntryError(
+                f"Unable to load replay file {replay_file}: {err}"
+            ) from err
+        _LOGGER.warning("Replaying captured traffic from %s", replay_file)
+
     api = OrcommConnectAPI(
         host=entry.data[CONF_HOST],
         username=entry.data[CONF_USERNAME],
@@ -61,17 +101,35 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    async_ensure_webhook_id(hass, entry)
+    async_register_push_webhook(hass, entry, coordinator)
+    async_setup_services(hass)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        async_unregister_push_webhook(hass, entry)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        await entry_data["coordinator"].async_unload()
+        if not hass.data[DOMAIN]:
+            async_unload_services(hass)
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Drop the snapshots of a removed config entry."""
+    hass.data.get(DATA_SNAPSHOTS, {}).pop(entry.entry_id, None)
+
+
 class OrcommConnectAPI:
     """API client for Orcomm Connect."""
 
@@ -82,9 +140,37 @@ class OrcommConnectAPI:
         self.password = password
         self.session = session
         self.base_url = f"http://{host}:1443"
+        self._capture: CaptureSession | None = None
 
-    async def async_get_devices(self) -> list[dict]:
-        """Get all devices from the Orcomm Connect system."""
+    def start_capture(self, hass: HomeAssistant, path: str) -> None:
+        """Record all requests and responses to path until stopped."""
+        if self._capture is not None:
+            self.stop_capture()
+        self._capture = CaptureSession(hass, self.session, path)
+        self.session = self._capture
+        _LOGGER.info("Capturing Orcomm Connect traffic to %s", path)
+
+    def stop_capture(self) -> int:
+        """Stop recording and return the number of captured exchanges."""
+        if self._capture is None:
+            return 0
+        capture, self._capture = self._capture, None
+        self.session = capture.session
+        _LOGGER.info("Captured %d exchanges to %s", capture.count, capture.path)
+        return capture.count
+
+    async def async_get_devices(
+        self,
+        on_device: Callable[[dict], None] | None = None,
+        timings: dict[str, float] | None = None,
+    ) -> list[dict]:
+        """Get all devices from the Orcomm Connect system.
+
+        If given, on_device is called with every device as soon as it has
+        been decoded. Large responses are parsed incrementally from the
+        response stream instead of being buffered in full. If timings is
+        given, the time spent decoding is added to its "decode" key.
+        """
         url = f"{self.base_url}/devices"
         auth = aiohttp.BasicAuth(self.username, self.password)
         
@@ -92,40 +178,122 @@ class OrcommConnectAPI:
             async with async_timeout.timeout(10):
                 async with self.session.get(url, auth=auth) as response:
                     response.raise_for_status()
-                    data = await response.json()
-                    return data.get("devices", [])
+                    if (
+                        response.content_length is not None
+                        and response.content_length <= STREAM_THRESHOLD
+                    ):
+                        # Read the body before timing so decode excludes the transfer
+                        body = await response.read()
+                        start = time.perf_counter()
+                        data = json.loads(body)
+                        devices = data.get("devices", [])
+                        if on_device is not None:
+                            for device in devices:
+                                on_device(device)
+                        if timings is not None:
+                            timings["decode"] = time.perf_counter() - start
+                        return devices
+                    return await self._async_stream_devices(response, on_device, timings)
         except asyncio.TimeoutError as err:
             raise UpdateFailed("Timeout communicating with Orcomm Connect") from err
         except aiohttp.ClientError as err:
             raise UpdateFailed(f"Error communicating with Orcomm Connect: {err}") from err
+        except ValueError as err:
+            # Invalid JSON, including DevicesStreamError from the stream parser
+            raise UpdateFailed(f"Invalid response from Orcomm Connect: {err}") from err
+
+    async def _async_stream_devices(
+        self,
+        response: aiohttp.ClientResponse,
+        on_device: Callable[[dict], None] | None,
+        timings: dict[str, float] | None = None,
+    ) -> list[dict]:
+        """Parse the devices array from the response body chunk by chunk."""
+        devices: list[dict] = []
+
+        def handle_device(device: dict) -> None:
+            devices.append(device)
+            if on_device is not None:
+                on_device(device)
+
+        parser = DevicesStreamParser(handle_device, STREAM_MAX_ELEMENT_SIZE)
+        if timings is None:
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                parser.feed(chunk)
+            parser.close()
+            return devices
+
+        decode = 0.0
+        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+            start = time.perf_counter()
+            parser.feed(chunk)
+            decode += time.perf_counter() - start
+        start = time.perf_counter()
+        parser.close()
+        timings["decode"] = decode + time.perf_counter() - start
+        return devices
 
     async def async_switch_device(self, device_uid: str, power_state: bool, brightness: int = None) -> bool:
         """Switch a device on or off with optional brightness."""
-        url = f"{self.base_url}/device/switch"
-        auth = aiohttp.BasicAuth(self.username, self.password)
-        
-        payload = {
-            "switches": [
-                {
-                    "device_uid": device_uid,
-                    "power_state": power_state,
-                }
-            ]
+        switch = {
+            "device_uid": device_uid,
+            "power_state": power_state,
         }
         
         if brightness is not None:
-            payload["switches"][0]["brightness"] = brightness
+            switch["brightness"] = brightness
+
+        if await self.async_switch_devices([switch]):
+            raise UpdateFailed(f"Orcomm Connect failed to switch {device_uid}")
+        return True
+
+    async def async_switch_devices(self, switches: list[dict]) -> list[str]:
+        """Switch several devices, retrying only those that failed.
+
+        Switch commands carry absolute states, so resending them is safe.
+        Returns the UIDs that still failed after all retries.
+        """
+        remaining = switches
+        for attempt in range(SWITCH_RETRIES + 1):
+            if attempt:
+                await asyncio.sleep(SWITCH_RETRY_BACKOFF * 2 ** (attempt - 1))
+                _LOGGER.debug(
+                    "Retrying %d failed switch command(s), attempt %d",
+                    len(remaining),
+                    attempt + 1,
+                )
+            try:
+                failed = await self._async_post_switches(remaining)
+            except UpdateFailed:
+                if attempt == SWITCH_RETRIES:
+                    raise
+                continue
+            remaining = [switch for switch in remaining if switch["device_uid"] in failed]
+            if not remaining:
+                return []
+        return [switch["device_uid"] for switch in remaining]
+
+    async def _async_post_switches(self, switches: list[dict]) -> set[str]:
+        """Send one /device/switch request and return the UIDs that failed."""
+        url = f"{self.base_url}/device/switch"
+        auth = aiohttp.BasicAuth(self.username, self.password)
+        payload = {"switches": switches}
 
         try:
             async with async_timeout.timeout(10):
                 async with self.session.post(url, json=payload, auth=auth) as response:
                     response.raise_for_status()
-                    return True
+                    try:
+                        data = await response.json(content_type=None)
+                    except ValueError:
+                        data = None
         except asyncio.TimeoutError as err:
             raise UpdateFailed("Timeout communicating with Orcomm Connect") from err
         except aiohttp.ClientError as err:
             raise UpdateFailed(f"Error communicating with Orcomm Connect: {err}") from err
 
+        return _failed_switches(data, switches)
+
     async def async_locate_device(self, address: int, channel: int = 0, state: bool = True) -> bool:
         """Locate a device by making it blink."""
         url = f"{self.base_url}/device/locate"
@@ -149,6 +317,28 @@ class OrcommConnectAPI:
             raise UpdateFailed(f"Error communicating with Orcomm Connect: {err}") from err
 
 
+def _failed_switches(data, switches: list[dict]) -> set[str]:
+    """Return the UIDs a /device/switch response reports as failed.
+
+    Hubs that answer without a body or without per-switch results are
+    trusted on the HTTP status alone.
+    """
+    if not isinstance(data, dict):
+        return set()
+    results = data.get("switches", data.get("results"))
+    if isinstance(results, list):
+        return {
+            result["device_uid"]
+            for result in results
+            if isinstance(result, dict)
+            and "device_uid" in result
+            and (result.get("success") is False or result.get("error"))
+        }
+    if data.get("success") is False:
+        return {switch["device_uid"] for switch in switches}
+    return set()
+
+
 class OrcommConnectDataUpdateCoordinator(DataUpdateCoordinator):
     """Data update coordinator for Orcomm Connect."""
 
@@ -166,10 +356,203 @@ class OrcommConnectDataUpdateCoordinator(DataUpdateCoordinator):
             update_interval=scan_interval,
         )
         self.api = api
+        self._scan_interval = scan_interval
+        self._modules: dict[str, dict] = {}
+        self._module_listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        self._last_push: float | None = None
+        self._expected: dict[str, tuple[int, dict]] = {}
+        self._refresh_generation = 0
+        self.profiler: RefreshProfiler | None = None
+        self._profile_path: str | None = None
+
+    def get_module(self, device_uid: str) -> dict | None:
+        """Return the latest module data for a device UID."""
+        return self._modules.get(device_uid)
+
+    @callback
+    def async_expect_state(
+        self, device_uid: str, power_state: bool, brightness: int | None = None
+    ) -> None:
+        """Record a commanded state to be verified by the next poll.
+
+        The expectation is tagged with the generation of the latest refresh
+        started so far; only a refresh started after the command was
+        acknowledged can confirm it.
+        """
+        expected = {"power_state": power_state}
+        if power_state and brightness is not None:
+            expected["brightness"] = brightness
+        self._expected[device_uid] = (self._refresh_generation, expected)
+
+    def get_expected_state(self, device_uid: str) -> dict | None:
+        """Return the commanded state of a module not yet verified by a poll or push."""
+        if (expected := self._expected.get(device_uid)) is None:
+            return None
+        return expected[1]
+
+    def _check_drift(self, generation: int) -> None:
+        """Warn about modules that do not report their commanded state."""
+        for device_uid, (acknowledged, state) in list(self._expected.items()):
+            if acknowledged >= generation:
+                # The fetch started before the command was acknowledged
+                continue
+            del self._expected[device_uid]
+            module = self._modules.get(device_uid)
+            if module is None:
+                continue
+            actual = {key: module.get(key) for key in state}
+            if actual != state:
+                _LOGGER.warning(
+                    "Module %s reports %s after being commanded to %s",
+                    device_uid,
+                    actual,
+                    state,
+                )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners, timing them while profiling."""
+        profiler = self.profiler
+        if profiler is None:
+            super().async_update_listeners()
+            return
+        start = time.perf_counter()
+        super().async_update_listeners()
+        profiler.record_fan_out(time.perf_counter() - start)
+
+    async def async_start_profiling(
+        self, duration: float, top_n: int, with_cprofile: bool, path: str
+    ) -> None:
+        """Profile refreshes for duration seconds and write the results to path."""
+        # Write out the results of a profile that is still running
+        await self.async_stop_profiling()
+        profiler = RefreshProfiler(top_n, with_cprofile)
+        self.profiler = profiler
+        self._profile_path = path
+
+        @callback
+        def finish(_now) -> None:
+            profiler.cancel_timer = None
+            self.hass.async_create_task(self.async_stop_profiling())
+
+        profiler.cancel_timer = async_call_later(self.hass, duration, finish)
+        _LOGGER.info("Profiling %s refreshes for %ss", self.name, duration)
+
+    async def async_stop_profiling(self) -> dict | None:
+        """Stop profiling, log the summary and write the results."""
+        profiler, self.profiler = self.profiler, None
+        path, self._profile_path = self._profile_path, None
+        if profiler is None:
+            return None
+        cprofile = profiler.stop()
+        summary = profiler.summary()
+        _LOGGER.info("Profiling results for %s: %s", self.name, summary)
+        await self.hass.async_add_executor_job(write_results, path, summary, cprofile)
+        return summary
+
+    async def async_unload(self) -> None:
+        """Release timers, listeners and state before the entry unloads."""
+        # Write out a profile that is still running rather than dropping it
+        await self.async_stop_profiling()
+        self.api.stop_capture()
+        await super().async_shutdown()
+        self._module_listeners.clear()
+        self._expected.clear()
+        self._modules = {}
+
+    @property
+    def push_active(self) -> bool:
+        """Return true if the hub has pushed state recently."""
+        return (
+            self._last_push is not None
+            and time.monotonic() - self._last_push < PUSH_SAFETY_SCAN_INTERVAL
+        )
+
+    @callback
+    def async_add_module_listener(
+        self, device_uid: str, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Listen for pushed updates of a single module."""
+        listeners = self._module_listeners.setdefault(device_uid, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            listeners.remove(update_callback)
+            if not listeners:
+                self._module_listeners.pop(device_uid, None)
+
+        return remove_listener
+
+    @callback
+    def async_handle_push(self, events: list[dict]) -> int:
+        """Apply pushed module state changes and update affected entities."""
+        changed: set[str] = set()
+        for event in events:
+            module = self._modules.get(event["device_uid"])
+            if module is None:
+                continue
+            # The pushed state is newer than any command still awaiting a poll
+            self._expected.pop(event["device_uid"], None)
+            for key in ("power_state", "brightness"):
+                if key in event and module.get(key) != event[key]:
+                    module[key] = event[key]
+                    changed.add(event["device_uid"])
+
+        if self._last_push is None:
+            _LOGGER.info(
+                "Push updates received, polling every %ss as a safety net",
+                PUSH_SAFETY_SCAN_INTERVAL,
+            )
+        self._last_push = time.monotonic()
+        self.update_interval = max(
+            self._scan_interval, timedelta(seconds=PUSH_SAFETY_SCAN_INTERVAL)
+        )
+
+        profiler = self.profiler
+        if profiler is None:
+            self._async_update_module_listeners(changed)
+        else:
+            start = time.perf_counter()
+            self._async_update_module_listeners(changed)
+            profiler.record_fan_out(time.perf_counter() - start)
+        return len(changed)
+
+    @callback
+    def _async_update_module_listeners(self, device_uids: set[str]) -> None:
+        """Call the listeners of the given modules."""
+        for device_uid in device_uids:
+            for update_callback in list(self._module_listeners.get(device_uid, ())):
+                update_callback()
 
     async def _async_update_data(self) -> list[dict]:
         """Update data via library."""
+        modules: dict[str, dict] = {}
+
+        def index_device(device: dict) -> None:
+            for module in device.get("modules", []):
+                modules[module["device_uid"]] = module
+
+        self._refresh_generation += 1
+        generation = self._refresh_generation
+        profiler = self.profiler
         try:
-            return await self.api.async_get_devices()
+            if profiler is None:
+                devices = await self.api.async_get_devices(index_device)
+            else:
+                timings: dict[str, float] = {}
+                start = time.perf_counter()
+                devices = await self.api.async_get_devices(
+                    profiler.wrap_index(index_device), timings
+                )
+                profiler.record_refresh(time.perf_counter() - start, timings)
         except Exception as err:
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
\ No newline at end of file
+            raise UpdateFailed(f"Error communicating with API: {err}") from err
+        self._modules = modules
+        self._check_drift(generation)
+
+        if self._last_push is not None and not self.push_active:
+            _LOGGER.info("No push updates received recently, resuming normal polling")
+            self._last_push = None
+            self.update_interval = self._scan_interval
+        return devices
\ No newline at end of file
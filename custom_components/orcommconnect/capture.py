@@ -0,0 +1,282 @@
+"""Traffic capture and replay for Orcomm Connect API sessions."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any
+from urllib.parse import urlsplit
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from homeassistant.core import HomeAssistant
+from yarl import URL
+
+_LOGGER = logging.getLogger(__name__)
+
+REDACTED = "**REDACTED**"
+REDACT_KEYS = {"username", "password", "token", "authorization", "auth"}
+
+ERROR_TIMEOUT = "timeout"
+ERROR_CONNECTION = "connection"
+
+
+def redact(data: Any) -> Any:
+    """Return data with credential-like values replaced."""
+    if isinstance(data, dict):
+        return {
+            key: REDACTED if str(key).lower() in REDACT_KEYS else redact(value)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [redact(value) for value in data]
+    return data
+
+
+class CapturedResponse:
+    """Response served from a fully read or recorded body.
+
+    Implements the subset of ``aiohttp.ClientResponse`` used by the API
+    client, so captured and replayed traffic goes through the same code
+    paths as live traffic.
+    """
+
+    def __init__(self, method: str, url: str, status: int, body: bytes, content_type: str):
+        """Initialize the response."""
+        self.method = method
+        self.url = url
+        self.status = status
+        self.content_type = content_type
+        self._body = body
+        self.content = _CapturedContent(body)
+
+    @property
+    def content_length(self) -> int:
+        """Return the body size."""
+        return len(self._body)
+
+    def raise_for_status(self) -> None:
+        """Raise if the recorded status is an error."""
+        if self.status >= 400:
+            request_info = aiohttp.RequestInfo(
+                URL(self.url), self.method, CIMultiDictProxy(CIMultiDict())
+            )
+            raise aiohttp.ClientResponseError(
+                request_info, (), status=self.status, message="Recorded error status"
+            )
+
+    async def read(self) -> bytes:
+        """Return the body."""
+        return self._body
+
+    async def text(self) -> str:
+        """Return the body as text."""
+        return self._body.decode()
+
+    async def json(self, content_type: str | None = "application/json") -> Any:
+        """Return the decoded JSON body."""
+        return json.loads(self._body)
+
+
+class _CapturedContent:
+    """Stream reader over a recorded body."""
+
+    def __init__(self, body: bytes):
+        """Initialize the reader."""
+        self._body = body
+
+    async def iter_chunked(self, size: int):
+        """Yield the body in chunks of size bytes."""
+        for start in range(0, len(self._body), size):
+            yield self._body[start : start + size]
+
+
+class _RequestContext:
+    """Async context manager returned by the capture and replay sessions."""
+
+    def __init__(self, coro):
+        """Initialize the context."""
+        self._coro = coro
+
+    async def __aenter__(self) -> CapturedResponse:
+        return await self._coro
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+
+class CaptureSession:
+    """Session wrapper that records requests and responses to a file.
+
+    Every exchange is appended as one JSON line with the method, path,
+    redacted request payload, status, redacted body and elapsed time.
+    Requests that time out or fail are recorded with an ``error`` instead,
+    so hub outages can be replayed too. The host and the basic auth
+    credentials are never written.
+    """
+
+    def __init__(self, hass: HomeAssistant, session, path: str):
+        """Initialize the capture."""
+        self.hass = hass
+        self.session = session
+        self.path = path
+        self.count = 0
+        self._start = time.monotonic()
+        self._write_lock = threading.Lock()
+
+    def request(self, method: str, url: str, **kwargs) -> _RequestContext:
+        """Perform a recorded request."""
+        return _RequestContext(self._async_request(method, url, **kwargs))
+
+    def get(self, url: str, **kwargs) -> _RequestContext:
+        """Perform a recorded GET request."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> _RequestContext:
+        """Perform a recorded POST request."""
+        return self.request("POST", url, **kwargs)
+
+    async def _async_request(self, method: str, url: str, **kwargs) -> CapturedResponse:
+        """Perform the request, read the body and record the exchange."""
+        offset = time.monotonic() - self._start
+        record = {
+            "method": method,
+            "path": urlsplit(url).path,
+            "request": redact(kwargs.get("json")),
+            "offset": round(offset, 6),
+        }
+        try:
+            async with self.session.request(method, url, **kwargs) as response:
+                body = await response.read()
+                status = response.status
+                content_type = response.content_type
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            # The API client's timeout cancels the request
+            self._record(record, offset, error=ERROR_TIMEOUT)
+            raise
+        except aiohttp.ClientError as err:
+            self._record(record, offset, error=ERROR_CONNECTION, message=str(err))
+            raise
+
+        self._record(
+            record,
+            offset,
+            status=status,
+            content_type=content_type,
+            body=_redact_body(body),
+        )
+        return CapturedResponse(method, url, status, body, content_type)
+
+    def _record(self, record: dict, offset: float, **fields) -> None:
+        """Complete a record and write it without blocking the request."""
+        record.update(fields)
+        record["elapsed"] = round(time.monotonic() - self._start - offset, 6)
+        self.count += 1
+        self.hass.async_add_executor_job(self._write_record, record)
+
+    def _write_record(self, record: dict) -> None:
+        """Append a record to the capture file."""
+        with self._write_lock, open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record) + "\n")
+
+
+def _redact_body(body: bytes) -> str:
+    """Return the body as text with credentials removed from JSON content."""
+    text = body.decode(errors="replace")
+    try:
+        return json.dumps(redact(json.loads(text)))
+    except ValueError:
+        return text
+
+
+class ReplaySession:
+    """Session that serves captured responses instead of a hub.
+
+    Responses are matched by method, path and redacted request payload,
+    so a ``/device/switch`` response only answers a request for the same
+    switches. Matching captures are handed out in recorded order, starting
+    over once they are exhausted. Each response is delayed by its recorded
+    elapsed time divided by ``speed``; a speed of 0 serves responses
+    without delay. The recorded request timing is not reproduced: requests
+    are made when the integration makes them. Recorded failures are raised
+    again as timeouts or connection errors.
+    """
+
+    def __init__(self, records: list[dict], speed: float = 1.0):
+        """Initialize the replay."""
+        self.speed = speed
+        self._records: dict[tuple[str, str, str], list[dict]] = defaultdict(list)
+        for record in sorted(records, key=lambda record: record["offset"]):
+            key = (record["method"], record["path"], _payload_key(record.get("request")))
+            self._records[key].append(record)
+        self._positions: dict[tuple[str, str, str], int] = defaultdict(int)
+
+    @classmethod
+    async def async_from_file(
+        cls, hass: HomeAssistant, path: str, speed: float = 1.0
+    ) -> ReplaySession:
+        """Load a capture file written by CaptureSession.
+
+        Raises OSError if the file cannot be read and ValueError if it does
+        not contain capture records.
+        """
+        records = await hass.async_add_executor_job(_read_records, path)
+        _LOGGER.debug("Loaded %d captured exchanges from %s", len(records), path)
+        return cls(records, speed)
+
+    def request(self, method: str, url: str, **kwargs) -> _RequestContext:
+        """Serve a captured response."""
+        return _RequestContext(self._async_replay(method, url, kwargs.get("json")))
+
+    def get(self, url: str, **kwargs) -> _RequestContext:
+        """Serve a captured GET response."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> _RequestContext:
+        """Serve a captured POST response."""
+        return self.request("POST", url, **kwargs)
+
+    async def _async_replay(self, method: str, url: str, payload: Any) -> CapturedResponse:
+        """Return the next captured response for the request."""
+        key = (method, urlsplit(url).path, _payload_key(redact(payload)))
+        records = self._records.get(key)
+        if not records:
+            raise aiohttp.ClientConnectionError(
+                f"No captured response for {method} {key[1]} with this payload"
+            )
+
+        record = records[self._positions[key] % len(records)]
+        self._positions[key] += 1
+        if self.speed > 0:
+            await asyncio.sleep(record["elapsed"] / self.speed)
+
+        if (error := record.get("error")) is not None:
+            if error == ERROR_TIMEOUT:
+                raise asyncio.TimeoutError
+            raise aiohttp.ClientConnectionError(record.get("message", error))
+        return CapturedResponse(
+            method,
+            url,
+            record["status"],
+            record["body"].encode(),
+            record.get("content_type", "application/json"),
+        )
+
+
+def _payload_key(payload: Any) -> str:
+    """Return a request payload in a form usable as a lookup key."""
+    return json.dumps(payload, sort_keys=True)
+
+
+def _read_records(path: str) -> list[dict]:
+    """Read all records from a capture file."""
+    with open(path, encoding="utf-8") as file:
+        records = [json.loads(line) for line in file if line.strip()]
+    required = {"method", "path", "offset", "elapsed"}
+    for record in records:
+        if not isinstance(record, dict) or not required <= record.keys():
+            raise ValueError("Not an Orcomm Connect capture file")
+    return records
@@ -0,0 +1,115 @@
+"""Command gating for Orcomm Connect entities."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CommandGate:
+    """Coalesce and throttle commands for a single module.
+
+    Commands equal to the module state are dropped; while a sent command is
+    not yet confirmed by a refresh or push, they are compared to that
+    command instead. At most one command is in flight at a time, and
+    brightness-only changes are limited to ``max_rate`` per second.
+    Commands arriving while one is in flight or throttled replace each
+    other, so the last value is always delivered, even if the command in
+    flight fails.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[bool, int | None], Awaitable[None]],
+        get_state: Callable[[], dict],
+        get_expected: Callable[[], dict | None],
+        max_rate: float,
+    ):
+        """Initialize the gate."""
+        self._send = send
+        self._get_state = get_state
+        self._get_expected = get_expected
+        self._min_interval = 1 / max_rate if max_rate > 0 else 0.0
+        self._pending: tuple[bool, int | None] | None = None
+        self._last_command: tuple[bool, int | None] | None = None
+        self._last_sent = 0.0
+        self._running = False
+        self._closed = False
+        self._sleep: asyncio.Future | None = None
+
+    def close(self) -> None:
+        """Drop pending commands and stop a throttled submit from sending."""
+        self._closed = True
+        self._pending = None
+        if self._sleep is not None:
+            self._sleep.cancel()
+
+    async def async_submit(self, power_state: bool, brightness: int | None = None) -> None:
+        """Submit a command, sending it now or after the one in flight."""
+        if self._closed:
+            return
+        self._pending = (power_state, brightness)
+        if self._running:
+            return
+
+        self._running = True
+        try:
+            while self._pending is not None:
+                if self._is_brightness_change(self._pending):
+                    delay = self._last_sent + self._min_interval - time.monotonic()
+                    if delay > 0:
+                        self._sleep = asyncio.ensure_future(asyncio.sleep(delay))
+                        try:
+                            await self._sleep
+                        except asyncio.CancelledError:
+                            if not self._closed:
+                                raise
+                        finally:
+                            self._sleep = None
+
+                if self._closed:
+                    return
+                command, self._pending = self._pending, None
+                if self._is_confirmed(command):
+                    continue
+
+                self._last_command = command
+                self._last_sent = time.monotonic()
+                try:
+                    await self._send(*command)
+                except Exception as err:
+                    if self._pending is None:
+                        raise
+                    # The caller of the queued command has already returned
+                    _LOGGER.warning(
+                        "Command %s failed, sending the queued command %s: %s",
+                        command,
+                        self._pending,
+                        err,
+                    )
+        finally:
+            self._running = False
+            self._pending = None
+
+    def _is_brightness_change(self, command: tuple[bool, int | None]) -> bool:
+        """Return true if the command only changes brightness."""
+        return (
+            command[1] is not None
+            and self._last_command is not None
+            and self._last_command[0] == command[0]
+        )
+
+    def _is_confirmed(self, command: tuple[bool, int | None]) -> bool:
+        """Return true if the module is in, or is being set to, the commanded state."""
+        # A sent command is not reflected in the state until a refresh confirms it
+        state = self._get_expected()
+        if state is None:
+            state = self._get_state()
+        power_state, brightness = command
+        if bool(state.get("power_state", False)) != power_state:
+            return False
+        # Brightness only matters while the module is on
+        return not power_state or brightness is None or state.get("brightness") == brightness
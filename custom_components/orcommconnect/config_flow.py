@@ -8,13 +8,30 @@ import aiohttp
 import async_timeout
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    CONF_USERNAME,
+    CONF_WEBHOOK_ID,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.components import webhook
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DOMAIN, DEFAULT_PASSWORD, DEFAULT_USERNAME
+from .const import (
+    CONF_BRIGHTNESS_RATE,
+    CONF_REPLAY_FILE,
+    CONF_REPLAY_SPEED,
+    DOMAIN,
+    DEFAULT_BRIGHTNESS_RATE,
+    DEFAULT_REPLAY_SPEED,
+    DEFAULT_PASSWORD,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_USERNAME,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -158,6 +175,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._discovered_devices: list[dict[str, Any]] = []
         self._selected_host: str | None = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -312,6 +337,54 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle Orcomm Connect options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry):
+        """Initialize the options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_SCAN_INTERVAL,
+                    default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                vol.Required(
+                    CONF_BRIGHTNESS_RATE,
+                    default=options.get(CONF_BRIGHTNESS_RATE, DEFAULT_BRIGHTNESS_RATE),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=30)),
+                vol.Optional(
+                    CONF_REPLAY_FILE,
+                    description={"suggested_value": options.get(CONF_REPLAY_FILE)},
+                ): str,
+                vol.Required(
+                    CONF_REPLAY_SPEED,
+                    default=options.get(CONF_REPLAY_SPEED, DEFAULT_REPLAY_SPEED),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            }
+        )
+
+        webhook_id = self._entry.data.get(CONF_WEBHOOK_ID)
+        return self.async_show_form(
+            step_id="init",
+            data_schema=data_schema,
+            description_placeholders={
+                "webhook_path": webhook.async_generate_path(webhook_id)
+                if webhook_id
+                else "not yet available",
+            },
+        )
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
@@ -4,13 +4,43 @@ DOMAIN = "orcommconnect"
 
 # Config flow
 CONF_HOST = "host"
+CONF_BRIGHTNESS_RATE = "brightness_rate"
+CONF_REPLAY_FILE = "replay_file"
+CONF_REPLAY_SPEED = "replay_speed"
 
 # Default values
 DEFAULT_SCAN_INTERVAL = 30
+DEFAULT_BRIGHTNESS_RATE = 5
+DEFAULT_REPLAY_SPEED = 1.0
 DEFAULT_PORT = 1443
 DEFAULT_USERNAME = "admin"
 DEFAULT_PASSWORD = "orcomm"
 
+# /devices responses larger than this are parsed incrementally
+STREAM_THRESHOLD = 64 * 1024
+STREAM_CHUNK_SIZE = 16 * 1024
+STREAM_MAX_ELEMENT_SIZE = 256 * 1024
+
+# Switch commands
+SWITCH_RETRIES = 2
+SWITCH_RETRY_BACKOFF = 0.5
+SWITCH_BATCH_SIZE = 64
+
+# Services
+SERVICE_SNAPSHOT = "snapshot"
+SERVICE_RESTORE = "restore"
+SERVICE_START_CAPTURE = "start_capture"
+SERVICE_STOP_CAPTURE = "stop_capture"
+SERVICE_PROFILE = "profile"
+DEFAULT_SNAPSHOT_NAME = "default"
+# Snapshots per entry ID, kept outside the entry data so reloads keep them
+DATA_SNAPSHOTS = f"{DOMAIN}_snapshots"
+DEFAULT_PROFILE_DURATION = 60
+DEFAULT_PROFILE_TOP_N = 10
+
+# Push updates
+PUSH_SAFETY_SCAN_INTERVAL = 300
+
 # Device types
 DEVICE_TYPE_SWITCH = 1
 DEVICE_TYPE_DIMMER = 2
@@ -1,4 +1,8 @@
 """Base entity for Orcomm Connect integration."""
+import time
+from collections.abc import Callable
+
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -28,6 +32,36 @@ class OrcommConnectEntity(CoordinatorEntity[OrcommConnectDataUpdateCoordinator])
             via_device=(DOMAIN, "hub"),
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to pushed updates for this module."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_module_listener(
+                self._module["device_uid"], self._handle_module_push
+            )
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._async_profiled(super()._handle_coordinator_update)
+
+    @callback
+    def _handle_module_push(self) -> None:
+        """Handle a pushed update of this entity's module."""
+        self._async_profiled(self.async_write_ha_state)
+
+    @callback
+    def _async_profiled(self, update: Callable[[], None]) -> None:
+        """Run an update, timing it while the coordinator is profiling."""
+        profiler = self.coordinator.profiler
+        if profiler is None:
+            update()
+            return
+        start = time.perf_counter()
+        update()
+        profiler.record_entity(self.entity_id, time.perf_counter() - start)
+
     @property
     def unique_id(self) -> str:
         """Return unique ID for the entity."""
@@ -65,10 +99,8 @@ class OrcommConnectEntity(CoordinatorEntity[OrcommConnectDataUpdateCoordinator])
         """Get the current module data from coordinator."""
         if not self.coordinator.data:
             return self._module
-            
-        for device in self.coordinator.data:
-            if device["address"] == self._device["address"]:
-                for module in device["modules"]:
-                    if module["device_uid"] == self._module["device_uid"]:
-                        return module
-        return self._module
\ No newline at end of file
+
+        module = self.coordinator.get_module(self._module["device_uid"])
+        if module is None:
+            return self._module
+        return module
\ No newline at end of file
@@ -12,7 +12,13 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import OrcommConnectDataUpdateCoordinator
-from .const import DEVICE_TYPE_DIMMER, DOMAIN
+from .command import CommandGate
+from .const import (
+    CONF_BRIGHTNESS_RATE,
+    DEFAULT_BRIGHTNESS_RATE,
+    DEVICE_TYPE_DIMMER,
+    DOMAIN,
+)
 from .entity import OrcommConnectEntity
 
 _LOGGER = logging.getLogger(__name__)
@@ -28,13 +34,16 @@ async def async_setup_entry(
     coordinator: OrcommConnectDataUpdateCoordinator = data["coordinator"]
     api = data["api"]
     devices = data["devices"]
+    brightness_rate = entry.options.get(CONF_BRIGHTNESS_RATE, DEFAULT_BRIGHTNESS_RATE)
 
     entities = []
     for device in devices:
         for module in device["modules"]:
             # Only create light entities for dimmer type devices
             if module["type"] == DEVICE_TYPE_DIMMER:
-                entities.append(OrcommConnectLight(coordinator, api, device, module))
+                entities.append(
+                    OrcommConnectLight(coordinator, api, device, module, brightness_rate)
+                )
 
     async_add_entities(entities)
 
@@ -45,10 +54,21 @@ class OrcommConnectLight(OrcommConnectEntity, LightEntity):
     _attr_color_mode = ColorMode.BRIGHTNESS
     _attr_supported_color_modes = {ColorMode.BRIGHTNESS}
 
-    def __init__(self, coordinator, api, device, module):
+    def __init__(self, coordinator, api, device, module, brightness_rate=DEFAULT_BRIGHTNESS_RATE):
         """Initialize the light."""
         super().__init__(coordinator, device, module)
         self._api = api
+        self._gate = CommandGate(
+            self._async_send_command,
+            self._get_current_module,
+            self._get_expected_state,
+            brightness_rate,
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop throttled commands when the light is removed."""
+        self._gate.close()
+        await super().async_will_remove_from_hass()
 
     @property
     def is_on(self) -> bool:
@@ -76,27 +96,32 @@ class OrcommConnectLight(OrcommConnectEntity, LightEntity):
             brightness_percent = int(brightness * 100 / 255)
         else:
             # If no brightness specified, always default to 100%
-            # Keep the module state check to ensure entity state is properly initialized
-            current_module = self._get_current_module()
             brightness_percent = 100
 
         try:
-            await self._api.async_switch_device(
-                device_uid=self._module["device_uid"],
-                power_state=True,
-                brightness=brightness_percent,
-            )
-            await self.coordinator.async_request_refresh()
+            await self._gate.async_submit(True, brightness_percent)
         except Exception as err:
             _LOGGER.error("Failed to turn on light %s: %s", self.unique_id, err)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the light off."""
         try:
-            await self._api.async_switch_device(
-                device_uid=self._module["device_uid"],
-                power_state=False,
-            )
-            await self.coordinator.async_request_refresh()
+            await self._gate.async_submit(False)
         except Exception as err:
-            _LOGGER.error("Failed to turn off light %s: %s", self.unique_id, err)
\ No newline at end of file
+            _LOGGER.error("Failed to turn off light %s: %s", self.unique_id, err)
+
+    def _get_expected_state(self) -> dict | None:
+        """Return the commanded state not yet confirmed by a refresh."""
+        return self.coordinator.get_expected_state(self._module["device_uid"])
+
+    async def _async_send_command(self, power_state: bool, brightness: int | None) -> None:
+        """Send a command that passed the gate and refresh the state."""
+        await self._api.async_switch_device(
+            device_uid=self._module["device_uid"],
+            power_state=power_state,
+            brightness=brightness,
+        )
+        self.coordinator.async_expect_state(
+            self._module["device_uid"], power_state, brightness
+        )
+        await self.coordinator.async_request_refresh()
\ No newline at end of file
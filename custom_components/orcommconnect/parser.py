@@ -0,0 +1,160 @@
+"""Incremental parser for Orcomm Connect /devices responses."""
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from collections.abc import Callable
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Characters that can follow a complete number or literal
+SCALAR_END = frozenset(" \t\n\r,}]")
+
+# Parser states
+_EXPECT_OBJECT = 0
+_EXPECT_KEY = 1
+_EXPECT_COLON = 2
+_EXPECT_VALUE = 3
+_EXPECT_MEMBER_SEP = 4
+_EXPECT_ELEMENT = 5
+_EXPECT_ELEMENT_SEP = 6
+_DONE = 7
+
+
+class DevicesStreamError(ValueError):
+    """Error to indicate the /devices response could not be parsed."""
+
+
+class DevicesStreamParser:
+    """Extract the top-level ``devices`` array from a response stream.
+
+    Chunks are fed as they arrive; every complete device object is decoded
+    as soon as its closing brace has been received and handed to
+    ``on_device``. Only the not yet complete tail of the stream is kept in
+    memory, and a single element larger than ``max_element_size`` aborts
+    the parse instead of growing the buffer without bound.
+    """
+
+    def __init__(
+        self,
+        on_device: Callable[[dict], None],
+        max_element_size: int,
+    ):
+        """Initialize the parser."""
+        self._on_device = on_device
+        self._max_element_size = max_element_size
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._state = _EXPECT_OBJECT
+        self._key: str | None = None
+        self.count = 0
+
+    def feed(self, chunk: bytes) -> None:
+        """Feed a chunk of the response body."""
+        self._buffer += self._text_decoder.decode(chunk)
+        self._parse(final=False)
+
+    def close(self) -> None:
+        """Finish parsing once the response body is exhausted."""
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        self._parse(final=True)
+        if self._state != _DONE:
+            raise DevicesStreamError("Truncated response")
+
+    def _parse(self, final: bool) -> None:
+        """Consume as much of the buffer as possible."""
+        buf = self._buffer
+        pos = 0
+        end = len(buf)
+
+        while True:
+            pos = WHITESPACE.match(buf, pos).end()
+            if pos == end:
+                break
+            char = buf[pos]
+
+            if self._state == _EXPECT_OBJECT:
+                if char != "{":
+                    raise DevicesStreamError("Response is not a JSON object")
+                pos += 1
+                self._state = _EXPECT_KEY
+            elif self._state == _EXPECT_KEY:
+                if char == "}":
+                    pos += 1
+                    self._state = _DONE
+                    continue
+                if char != '"':
+                    raise DevicesStreamError(f"Expected key at offset {pos}")
+                value, next_pos = self._decode(buf, pos, final)
+                if next_pos is None:
+                    break
+                self._key = value
+                pos = next_pos
+                self._state = _EXPECT_COLON
+            elif self._state == _EXPECT_COLON:
+                if char != ":":
+                    raise DevicesStreamError(f"Expected ':' at offset {pos}")
+                pos += 1
+                self._state = _EXPECT_VALUE
+            elif self._state == _EXPECT_VALUE:
+                if self._key == "devices" and char == "[":
+                    pos += 1
+                    self._state = _EXPECT_ELEMENT
+                    continue
+                # Other top-level members are decoded and discarded
+                _, next_pos = self._decode(buf, pos, final)
+                if next_pos is None:
+                    break
+                pos = next_pos
+                self._state = _EXPECT_MEMBER_SEP
+            elif self._state == _EXPECT_MEMBER_SEP:
+                if char not in ",}":
+                    raise DevicesStreamError(f"Expected ',' or '}}' at offset {pos}")
+                pos += 1
+                self._state = _EXPECT_KEY if char == "," else _DONE
+            elif self._state == _EXPECT_ELEMENT:
+                if char == "]" and self.count == 0:
+                    pos += 1
+                    self._state = _EXPECT_MEMBER_SEP
+                    continue
+                if char != "{":
+                    raise DevicesStreamError(f"Expected device object at offset {pos}")
+                device, next_pos = self._decode(buf, pos, final)
+                if next_pos is None:
+                    break
+                pos = next_pos
+                self.count += 1
+                self._on_device(device)
+                self._state = _EXPECT_ELEMENT_SEP
+            elif self._state == _EXPECT_ELEMENT_SEP:
+                if char not in ",]":
+                    raise DevicesStreamError(f"Expected ',' or ']' at offset {pos}")
+                pos += 1
+                self._state = _EXPECT_ELEMENT if char == "," else _EXPECT_MEMBER_SEP
+            else:
+                raise DevicesStreamError(f"Unexpected data after response at offset {pos}")
+
+        self._buffer = buf[pos:]
+        if len(self._buffer) > self._max_element_size:
+            raise DevicesStreamError(
+                f"Response element exceeds {self._max_element_size} bytes"
+            )
+
+    def _decode(self, buf: str, pos: int, final: bool):
+        """Decode one JSON value at pos, or return (None, None) if incomplete."""
+        try:
+            value, next_pos = self._decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError as err:
+            if final:
+                raise DevicesStreamError(str(err)) from err
+            return None, None
+        # A number or literal may be cut short by the end of the chunk, even
+        # after a "." or "e" that raw_decode stops in front of
+        if (
+            not final
+            and buf[pos] not in '{["'
+            and (next_pos == len(buf) or buf[next_pos] not in SCALAR_END)
+        ):
+            return None, None
+        return value, next_pos
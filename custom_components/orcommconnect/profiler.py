@@ -0,0 +1,157 @@
+"""Time-boxed refresh profiling for Orcomm Connect."""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import json
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+PHASES = ("fetch", "decode", "index", "fan_out", "state_write")
+
+
+class RefreshProfiler:
+    """Collect per-phase timings of coordinator refreshes.
+
+    A profiler only exists while profiling is running; the coordinator and
+    entities check for it and take their normal code path when it is not
+    set. The number of live asyncio tasks at start and end is recorded to
+    spot task leaks over long runs. Optionally a cProfile profile of the
+    event loop thread is recorded for the same time span.
+    """
+
+    def __init__(self, top_n: int, with_cprofile: bool = False):
+        """Initialize the profiler."""
+        self.top_n = top_n
+        self.started = time.time()
+        self.tasks_at_start = len(asyncio.all_tasks())
+        self.refreshes = 0
+        self._phases: dict[str, _Timing] = defaultdict(_Timing)
+        self._entities: dict[str, _Timing] = defaultdict(_Timing)
+        self._index_time = 0.0
+        self._state_write_time = 0.0
+        self._cprofile: cProfile.Profile | None = None
+        self.cancel_timer: Callable[[], None] | None = None
+
+        if with_cprofile:
+            self._cprofile = cProfile.Profile()
+            try:
+                self._cprofile.enable()
+            except ValueError as err:
+                # Another profiler is already active in this thread
+                _LOGGER.warning("Unable to start cProfile: %s", err)
+                self._cprofile = None
+
+    def wrap_index(self, index: Callable[[dict], None]) -> Callable[[dict], None]:
+        """Return index wrapped to accumulate its run time for one refresh."""
+        # Drop index time left over from a refresh that failed
+        self._index_time = 0.0
+
+        def timed_index(device: dict) -> None:
+            start = time.perf_counter()
+            index(device)
+            self._index_time += time.perf_counter() - start
+
+        return timed_index
+
+    def record_refresh(self, total: float, timings: dict[str, float]) -> None:
+        """Record a finished fetch given its total and decode time.
+
+        Indexing runs inside decoding and decoding inside the fetch, so each
+        phase is recorded without the time of the phase nested in it.
+        """
+        decode = timings.get("decode", 0.0)
+        self._phases["fetch"].add(total - decode)
+        self._phases["decode"].add(decode - self._index_time)
+        self._phases["index"].add(self._index_time)
+        self._index_time = 0.0
+        self.refreshes += 1
+
+    def record_fan_out(self, total: float) -> None:
+        """Record listener dispatch, split into state writes and overhead."""
+        self._phases["fan_out"].add(total - self._state_write_time)
+        self._phases["state_write"].add(self._state_write_time)
+        self._state_write_time = 0.0
+
+    def record_entity(self, entity_id: str, seconds: float) -> None:
+        """Record the time an entity took to handle an update."""
+        self._entities[entity_id].add(seconds)
+        self._state_write_time += seconds
+
+    def stop(self) -> cProfile.Profile | None:
+        """Stop profiling and return the cProfile profile, if any."""
+        if self.cancel_timer is not None:
+            self.cancel_timer()
+            self.cancel_timer = None
+        cprofile, self._cprofile = self._cprofile, None
+        if cprofile is not None:
+            cprofile.disable()
+        return cprofile
+
+    def summary(self) -> dict[str, Any]:
+        """Return the collected timings in milliseconds."""
+        phases = {phase: self._phases.get(phase, _Timing()).stats() for phase in PHASES}
+
+        entities = sorted(
+            ((entity_id, timing.stats()) for entity_id, timing in self._entities.items()),
+            key=lambda item: item[1]["max_ms"],
+            reverse=True,
+        )[: self.top_n]
+
+        return {
+            "started": self.started,
+            "duration": round(time.time() - self.started, 3),
+            "refreshes": self.refreshes,
+            "tasks": {"start": self.tasks_at_start, "end": len(asyncio.all_tasks())},
+            "phases": phases,
+            "slowest_entities": [
+                {"entity_id": entity_id, **stats} for entity_id, stats in entities
+            ],
+        }
+
+
+class _Timing:
+    """Running count, total and maximum of timing samples.
+
+    Samples are not kept, so memory stays constant however long profiling
+    runs.
+    """
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        """Initialize an empty timing."""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        """Add a sample."""
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def stats(self) -> dict[str, float]:
+        """Return count, total, mean and max in milliseconds."""
+        if not self.count:
+            return {"count": 0, "total_ms": 0.0, "mean_ms": 0.0, "max_ms": 0.0}
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total * 1000 / self.count, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+def write_results(path: str, summary: dict[str, Any], cprofile: cProfile.Profile | None) -> None:
+    """Write the summary as JSON and the cProfile stats next to it."""
+    with open(f"{path}.json", "w", encoding="utf-8") as file:
+        json.dump(summary, file, indent=2)
+    if cprofile is not None:
+        cprofile.dump_stats(f"{path}.prof")
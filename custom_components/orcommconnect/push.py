@@ -0,0 +1,109 @@
+"""Webhook push endpoint for Orcomm Connect state changes."""
+from __future__ import annotations
+
+import logging
+from http import HTTPStatus
+
+import voluptuous as vol
+from aiohttp import web
+from homeassistant.components import webhook
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant, callback
+
+from .const import ATTR_BRIGHTNESS, ATTR_DEVICE_UID, ATTR_POWER_STATE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _brightness(value):
+    """Validate a brightness percentage, rejecting booleans."""
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise vol.Invalid("brightness must be an integer")
+    return value
+
+
+EVENT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_UID): str,
+        vol.Optional(ATTR_POWER_STATE): bool,
+        vol.Optional(ATTR_BRIGHTNESS): vol.All(_brightness, vol.Range(min=0, max=100)),
+    },
+    extra=vol.REMOVE_EXTRA,
+)
+
+EVENTS_SCHEMA = vol.Schema([EVENT_SCHEMA])
+
+
+def _validate_push(body) -> list[dict]:
+    """Return the validated events of a push body."""
+    if isinstance(body, dict) and "events" in body:
+        return EVENTS_SCHEMA(body["events"])
+    return [EVENT_SCHEMA(body)]
+
+
+@callback
+def async_ensure_webhook_id(hass: HomeAssistant, entry: ConfigEntry) -> str:
+    """Return the entry's webhook ID, generating and storing one if missing."""
+    if webhook_id := entry.data.get(CONF_WEBHOOK_ID):
+        return webhook_id
+    webhook_id = webhook.async_generate_id()
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, CONF_WEBHOOK_ID: webhook_id}
+    )
+    _LOGGER.info(
+        "Push updates for %s are accepted at %s",
+        entry.title,
+        webhook.async_generate_path(webhook_id),
+    )
+    return webhook_id
+
+
+@callback
+def async_register_push_webhook(hass: HomeAssistant, entry: ConfigEntry, coordinator) -> None:
+    """Register the push webhook of a config entry.
+
+    The webhook ID is a random secret generated per entry; only requests
+    from the local network are accepted. The body is either a single event
+    or an object with an ``events`` list; every event names a
+    ``device_uid`` and carries the changed ``power_state`` and/or
+    ``brightness``.
+    """
+
+    async def async_handle_webhook(
+        hass: HomeAssistant, webhook_id: str, request: web.Request
+    ) -> web.Response:
+        """Handle a state-change event."""
+        try:
+            body = await request.json()
+        except ValueError:
+            return web.json_response(
+                {"message": "Invalid JSON"}, status=HTTPStatus.BAD_REQUEST
+            )
+
+        try:
+            events = _validate_push(body)
+        except vol.Invalid as err:
+            return web.json_response(
+                {"message": f"Invalid event payload: {err}"},
+                status=HTTPStatus.BAD_REQUEST,
+            )
+
+        updated = coordinator.async_handle_push(events)
+        _LOGGER.debug("Applied %d of %d pushed events", updated, len(events))
+        return web.json_response({"updated": updated})
+
+    webhook.async_register(
+        hass,
+        entry.domain,
+        entry.title,
+        entry.data[CONF_WEBHOOK_ID],
+        async_handle_webhook,
+        local_only=True,
+    )
+
+
+@callback
+def async_unregister_push_webhook(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the push webhook of a config entry."""
+    webhook.async_unregister(hass, entry.data[CONF_WEBHOOK_ID])
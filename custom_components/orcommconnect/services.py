@@ -0,0 +1,240 @@
+"""Services for Orcomm Connect integration."""
+from __future__ import annotations
+
+import logging
+import time
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import (
+    ATTR_BRIGHTNESS,
+    ATTR_DEVICE_TYPE,
+    ATTR_POWER_STATE,
+    DATA_SNAPSHOTS,
+    DEFAULT_PROFILE_DURATION,
+    DEFAULT_PROFILE_TOP_N,
+    DEFAULT_SNAPSHOT_NAME,
+    DEVICE_TYPE_DIMMER,
+    DOMAIN,
+    SERVICE_PROFILE,
+    SERVICE_RESTORE,
+    SERVICE_SNAPSHOT,
+    SERVICE_START_CAPTURE,
+    SERVICE_STOP_CAPTURE,
+    SWITCH_BATCH_SIZE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_NAME = "name"
+ATTR_FILENAME = "filename"
+ATTR_DURATION = "duration"
+ATTR_TOP = "top"
+ATTR_CPROFILE = "cprofile"
+
+SERVICE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_NAME, default=DEFAULT_SNAPSHOT_NAME): cv.string,
+    }
+)
+
+
+def _capture_filename(value) -> str:
+    """Validate a capture file name in the config directory."""
+    value = cv.string(value)
+    if (
+        any(separator in value for separator in ("/", "\\"))
+        or value.startswith(".")
+        or not value.endswith(".jsonl")
+    ):
+        raise vol.Invalid("filename must be a .jsonl file name without a directory")
+    return value
+
+
+START_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_FILENAME): _capture_filename,
+    }
+)
+
+STOP_CAPTURE_SCHEMA = vol.Schema({vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string})
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_DURATION, default=DEFAULT_PROFILE_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=86400)
+        ),
+        vol.Optional(ATTR_TOP, default=DEFAULT_PROFILE_TOP_N): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional(ATTR_CPROFILE, default=False): cv.boolean,
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services once."""
+    if hass.services.has_service(DOMAIN, SERVICE_SNAPSHOT):
+        return
+
+    async def async_snapshot(call: ServiceCall) -> None:
+        """Save the state of every module of the selected hubs."""
+        for entry_id, entry_data in _get_entry_items(hass, call):
+            snapshot = take_snapshot(entry_data["coordinator"].data or [])
+            _get_snapshots(hass, entry_id)[call.data[ATTR_NAME]] = snapshot
+            _LOGGER.debug(
+                "Saved snapshot %s with %d modules", call.data[ATTR_NAME], len(snapshot)
+            )
+
+    async def async_restore(call: ServiceCall) -> None:
+        """Restore a snapshot, switching only modules that differ."""
+        name = call.data[ATTR_NAME]
+        entries = _get_entry_items(hass, call)
+        # Check every hub first so a missing snapshot restores nothing
+        if any(name not in _get_snapshots(hass, entry_id) for entry_id, _ in entries):
+            raise HomeAssistantError(f"No Orcomm Connect snapshot named {name}")
+        for entry_id, entry_data in entries:
+            await async_restore_snapshot(
+                entry_data["api"],
+                entry_data["coordinator"],
+                _get_snapshots(hass, entry_id)[name],
+            )
+
+    async def async_start_capture(call: ServiceCall) -> None:
+        """Record the traffic of the selected hubs to the config directory."""
+        for entry_id, entry_data in _get_entry_items(hass, call):
+            filename = call.data.get(
+                ATTR_FILENAME, f"{DOMAIN}_capture_{entry_id}.jsonl"
+            )
+            entry_data["api"].start_capture(hass, hass.config.path(filename))
+
+    async def async_stop_capture(call: ServiceCall) -> None:
+        """Stop recording the traffic of the selected hubs."""
+        for entry_data in _get_entries(hass, call):
+            entry_data["api"].stop_capture()
+
+    async def async_profile(call: ServiceCall) -> None:
+        """Profile refreshes of the selected hubs for a limited time."""
+        for entry_id, entry_data in _get_entry_items(hass, call):
+            path = hass.config.path(f"{DOMAIN}_profile_{entry_id}_{int(time.time())}")
+            await entry_data["coordinator"].async_start_profiling(
+                call.data[ATTR_DURATION],
+                call.data[ATTR_TOP],
+                call.data[ATTR_CPROFILE],
+                path,
+            )
+
+    hass.services.async_register(DOMAIN, SERVICE_SNAPSHOT, async_snapshot, SERVICE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_RESTORE, async_restore, SERVICE_SCHEMA)
+    # Captures write files, so only administrators may start or stop them
+    async_register_admin_service(
+        hass, DOMAIN, SERVICE_START_CAPTURE, async_start_capture, START_CAPTURE_SCHEMA
+    )
+    async_register_admin_service(
+        hass, DOMAIN, SERVICE_STOP_CAPTURE, async_stop_capture, STOP_CAPTURE_SCHEMA
+    )
+    hass.services.async_register(DOMAIN, SERVICE_PROFILE, async_profile, PROFILE_SCHEMA)
+
+
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the integration services once no entry is loaded."""
+    for service in (
+        SERVICE_SNAPSHOT,
+        SERVICE_RESTORE,
+        SERVICE_START_CAPTURE,
+        SERVICE_STOP_CAPTURE,
+        SERVICE_PROFILE,
+    ):
+        hass.services.async_remove(DOMAIN, service)
+
+
+def _get_entries(hass: HomeAssistant, call: ServiceCall) -> list[dict]:
+    """Return the loaded entries a service call targets."""
+    return [entry_data for _, entry_data in _get_entry_items(hass, call)]
+
+
+def _get_entry_items(hass: HomeAssistant, call: ServiceCall) -> list[tuple[str, dict]]:
+    """Return the IDs and data of the loaded entries a service call targets."""
+    entries = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+    if entry_id is None:
+        return list(entries.items())
+    if entry_id not in entries:
+        raise HomeAssistantError(f"Orcomm Connect config entry {entry_id} is not loaded")
+    return [(entry_id, entries[entry_id])]
+
+
+def _get_snapshots(hass: HomeAssistant, entry_id: str) -> dict[str, dict]:
+    """Return the snapshots of an entry, which outlive reloads of the entry."""
+    return hass.data.setdefault(DATA_SNAPSHOTS, {}).setdefault(entry_id, {})
+
+
+def take_snapshot(devices: list[dict]) -> dict[str, dict]:
+    """Return the power state of every module and the brightness of dimmers."""
+    snapshot = {}
+    for device in devices:
+        for module in device["modules"]:
+            state = {ATTR_POWER_STATE: bool(module.get(ATTR_POWER_STATE, False))}
+            if module.get(ATTR_DEVICE_TYPE) == DEVICE_TYPE_DIMMER:
+                state[ATTR_BRIGHTNESS] = module.get(ATTR_BRIGHTNESS)
+            snapshot[module["device_uid"]] = state
+    return snapshot
+
+
+def diff_snapshot(snapshot: dict[str, dict], coordinator) -> list[dict]:
+    """Return switch commands for modules whose state differs from the snapshot."""
+    switches = []
+    for device_uid, state in snapshot.items():
+        module = coordinator.get_module(device_uid)
+        if module is None:
+            continue
+        power_state = state[ATTR_POWER_STATE]
+        brightness = state.get(ATTR_BRIGHTNESS) if power_state else None
+        if bool(module.get(ATTR_POWER_STATE, False)) == power_state and (
+            brightness is None or module.get(ATTR_BRIGHTNESS) == brightness
+        ):
+            continue
+        switch = {"device_uid": device_uid, ATTR_POWER_STATE: power_state}
+        if brightness is not None:
+            switch[ATTR_BRIGHTNESS] = brightness
+        switches.append(switch)
+    return switches
+
+
+async def async_restore_snapshot(api, coordinator, snapshot: dict[str, dict]) -> None:
+    """Send the minimal set of batched switch commands to restore a snapshot."""
+    switches = diff_snapshot(snapshot, coordinator)
+    if not switches:
+        _LOGGER.debug("Snapshot already matches the current state")
+        return
+
+    failed: list[str] = []
+    for start in range(0, len(switches), SWITCH_BATCH_SIZE):
+        batch = switches[start : start + SWITCH_BATCH_SIZE]
+        try:
+            failed.extend(await api.async_switch_devices(batch))
+        except UpdateFailed as err:
+            # Keep restoring the other batches and report this one as failed
+            _LOGGER.warning("Failed to restore %d modules: %s", len(batch), err)
+            failed.extend(switch["device_uid"] for switch in batch)
+
+    for switch in switches:
+        if switch["device_uid"] not in failed:
+            coordinator.async_expect_state(
+                switch["device_uid"], switch[ATTR_POWER_STATE], switch.get(ATTR_BRIGHTNESS)
+            )
+    await coordinator.async_request_refresh()
+
+    if failed:
+        raise HomeAssistantError(
+            f"Failed to restore Orcomm Connect modules: {', '.join(failed)}"
+        )
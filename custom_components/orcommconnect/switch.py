@@ -51,21 +51,22 @@ class OrcommConnectSwitch(OrcommConnectEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs) -> None:
         """Turn the switch on."""
         try:
-            await self._api.async_switch_device(
-                device_uid=self._module["device_uid"],
-                power_state=True,
-            )
-            await self.coordinator.async_request_refresh()
+            await self._async_send_command(True)
         except Exception as err:
             _LOGGER.error("Failed to turn on switch %s: %s", self.unique_id, err)
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn the switch off."""
         try:
-            await self._api.async_switch_device(
-                device_uid=self._module["device_uid"],
-                power_state=False,
-            )
-            await self.coordinator.async_request_refresh()
+            await self._async_send_command(False)
         except Exception as err:
-            _LOGGER.error("Failed to turn off switch %s: %s", self.unique_id, err)
\ No newline at end of file
+            _LOGGER.error("Failed to turn off switch %s: %s", self.unique_id, err)
+
+    async def _async_send_command(self, power_state: bool) -> None:
+        """Send a command and refresh the state."""
+        await self._api.async_switch_device(
+            device_uid=self._module["device_uid"],
+            power_state=power_state,
+        )
+        self.coordinator.async_expect_state(self._module["device_uid"], power_state)
+        await self.coordinator.async_request_refresh()
\ No newline at end of file
@@ -0,0 +1 @@
+"""Tests for the Orcomm Connect integration."""
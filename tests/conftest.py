@@ -0,0 +1,21 @@
+"""Fixtures for Orcomm Connect tests."""
+from collections.abc import AsyncGenerator
+
+import pytest
+
+from .fake_hub import FakeHub
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Enable loading the integration from custom_components."""
+    yield
+
+
+@pytest.fixture
+async def fake_hub(socket_enabled) -> AsyncGenerator[FakeHub, None]:
+    """Run a simulated hub on the local host."""
+    hub = FakeHub()
+    await hub.start()
+    yield hub
+    await hub.stop()
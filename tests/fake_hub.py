@@ -0,0 +1,137 @@
+"""Simulated Orcomm Connect hub for tests."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import random
+
+from aiohttp import web
+
+from custom_components.orcommconnect.const import (
+    DEFAULT_PORT,
+    DEVICE_TYPE_DIMMER,
+    DEVICE_TYPE_SWITCH,
+)
+
+FAULT_TIMEOUT = "timeout"
+FAULT_ERROR = "error"
+
+
+class FakeHub:
+    """Local HTTP server speaking the Orcomm Connect API.
+
+    Every device has ``channels`` modules, alternating between dimmers and
+    switches. ``set_fault`` makes requests stall (``"timeout"``) until the
+    fault is cleared, or answer with a server error (``"error"``), and
+    ``switch_failure_rate`` makes the hub report individual switches as
+    failed.
+    """
+
+    def __init__(self, devices: int = 100, channels: int = 3, seed: int = 0):
+        """Initialize the hub."""
+        self.fault: str | None = None
+        self.stall = 30.0
+        self._released = asyncio.Event()
+        self.switch_failure_rate = 0.0
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._runner: web.AppRunner | None = None
+        self.devices = [
+            {
+                "address": address,
+                "mac_address": f"00:11:22:33:{address // 256:02x}:{address % 256:02x}",
+                "channels": channels,
+                "modules": [
+                    {
+                        "channel": channel,
+                        "device_uid": f"{address:04d}-{channel}",
+                        "type": DEVICE_TYPE_DIMMER if channel % 2 else DEVICE_TYPE_SWITCH,
+                        "is_primary": channel == 0,
+                        "wiring_type": 1,
+                        "last_seen": 0,
+                        "multiway_group": 0,
+                        "power_state": False,
+                        "brightness": 0,
+                    }
+                    for channel in range(channels)
+                ],
+            }
+            for address in range(1, devices + 1)
+        ]
+        self.modules = {
+            module["device_uid"]: module
+            for device in self.devices
+            for module in device["modules"]
+        }
+
+    @property
+    def open_connections(self) -> int:
+        """Return the number of open client connections."""
+        if self._runner is None or self._runner.server is None:
+            return 0
+        return len(self._runner.server.connections)
+
+    def set_fault(self, fault: str | None) -> None:
+        """Inject a fault into all following requests, or clear it."""
+        self.fault = fault
+        if fault is None:
+            self._released.set()
+        else:
+            self._released.clear()
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> None:
+        """Start serving."""
+        app = web.Application()
+        app.router.add_get("/devices", self._handle_devices)
+        app.router.add_post("/device/switch", self._handle_switch)
+        app.router.add_post("/device/locate", self._handle_locate)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+
+    async def stop(self) -> None:
+        """Stop serving and close all connections."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _fault(self) -> web.Response | None:
+        """Apply the configured fault, if any."""
+        self.requests += 1
+        if self.fault == FAULT_TIMEOUT:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._released.wait(), self.stall)
+        if self.fault == FAULT_ERROR:
+            return web.Response(status=503, text="Service Unavailable")
+        return None
+
+    async def _handle_devices(self, request: web.Request) -> web.Response:
+        """Return all devices."""
+        if (response := await self._fault()) is not None:
+            return response
+        for module in self.modules.values():
+            module["last_seen"] = self._random.randint(0, 30)
+        return web.json_response({"devices": self.devices})
+
+    async def _handle_switch(self, request: web.Request) -> web.Response:
+        """Apply switch commands and report per-switch results."""
+        if (response := await self._fault()) is not None:
+            return response
+        payload = await request.json()
+        results = []
+        for switch in payload["switches"]:
+            module = self.modules.get(switch["device_uid"])
+            if module is None or self._random.random() < self.switch_failure_rate:
+                results.append({"device_uid": switch["device_uid"], "success": False})
+                continue
+            module["power_state"] = switch["power_state"]
+            if "brightness" in switch:
+                module["brightness"] = switch["brightness"]
+            results.append({"device_uid": switch["device_uid"], "success": True})
+        return web.json_response({"switches": results})
+
+    async def _handle_locate(self, request: web.Request) -> web.Response:
+        """Pretend to blink a device."""
+        if (response := await self._fault()) is not None:
+            return response
+        return web.json_response({"success": True})
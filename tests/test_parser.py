@@ -0,0 +1,105 @@
+"""Tests for the incremental /devices parser."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from custom_components.orcommconnect.parser import DevicesStreamError, DevicesStreamParser
+
+MAX_ELEMENT_SIZE = 64 * 1024
+
+PAYLOAD = {
+    "version": 1.5,
+    "hub": {"name": "Küche – Hub ☀", "uptime": 3.2e5, "tags": ["a", "b"]},
+    "devices": [
+        {
+            "address": 1,
+            "mac_address": "00:11:22:33:44:55",
+            "channels": 2,
+            "name": "Wohnzimmer 💡",
+            "modules": [
+                {"device_uid": "0001-0", "power_state": True, "brightness": 100},
+                {"device_uid": "0001-1", "power_state": False, "brightness": None},
+            ],
+        },
+        {"address": 2, "energy": -1.25e-3, "offset": 1e3, "modules": []},
+    ],
+    "count": 2,
+    "online": True,
+    "error": None,
+    "timestamp": 1712345678.125,
+}
+
+
+def _parse(chunks: list[bytes]) -> list[dict]:
+    """Feed chunks to a parser and return the decoded devices."""
+    devices: list[dict] = []
+    parser = DevicesStreamParser(devices.append, MAX_ELEMENT_SIZE)
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
+    return devices
+
+
+def _encode(payload, **kwargs) -> bytes:
+    """Return a payload as UTF-8 JSON without escaping non-ASCII text."""
+    return json.dumps(payload, ensure_ascii=False, **kwargs).encode()
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_split_at_every_offset(indent) -> None:
+    """Every two-chunk split of a payload yields the same devices."""
+    body = _encode(PAYLOAD, indent=indent)
+    for split in range(len(body) + 1):
+        assert _parse([body[:split], body[split:]]) == PAYLOAD["devices"], split
+
+
+def test_byte_by_byte() -> None:
+    """A payload fed one byte at a time yields the same devices."""
+    body = _encode(PAYLOAD)
+    assert _parse([body[i : i + 1] for i in range(len(body))]) == PAYLOAD["devices"]
+
+
+@pytest.mark.parametrize("number", ["1712345678.125", "-0.5", "1e10", "2.5E-3", "12"])
+def test_top_level_number_split(number: str) -> None:
+    """A number after the devices is not taken as complete when cut short."""
+    body = f'{{"devices": [{{"a": 1}}], "timestamp": {number}}}'.encode()
+    for split in range(len(body) + 1):
+        assert _parse([body[:split], body[split:]]) == [{"a": 1}], split
+
+
+@pytest.mark.parametrize("body", [b'{"devices": []}', b'{"devices": [], "count": 0}', b"{}"])
+def test_no_devices(body: bytes) -> None:
+    """Empty or missing device arrays yield no devices."""
+    for split in range(len(body) + 1):
+        assert _parse([body[:split], body[split:]]) == []
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"",
+        b"[]",
+        b'{"devices": [1]}',
+        b'{"devices": [{"a": 1}',
+        b'{"devices": [{"a": 1}] "count": 1}',
+        b'{"devices": [{"a": 1},]}',
+        b'{"devices": [], "timestamp": 1.}',
+        b'{"devices": [], "online": tru}',
+        b'{"devices": []} {}',
+        b'{"devices": [], 1: 2}',
+    ],
+)
+def test_invalid(body: bytes) -> None:
+    """Malformed or truncated responses raise DevicesStreamError."""
+    for split in range(len(body) + 1):
+        with pytest.raises(DevicesStreamError):
+            _parse([body[:split], body[split:]])
+
+
+def test_element_too_large() -> None:
+    """A single element larger than the limit aborts the parse."""
+    body = _encode({"devices": [{"name": "x" * 2 * MAX_ELEMENT_SIZE}]})
+    with pytest.raises(DevicesStreamError):
+        _parse([body[i : i + 4096] for i in range(0, len(body), 4096)])
@@ -0,0 +1,162 @@
+"""Tests for push updates through the Orcomm Connect webhook."""
+from __future__ import annotations
+
+from collections import Counter
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from homeassistant.components import webhook
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    CONF_WEBHOOK_ID,
+    STATE_OFF,
+    STATE_ON,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.aiohttp import MockRequest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.orcommconnect.const import (
+    DEFAULT_PASSWORD,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_USERNAME,
+    DOMAIN,
+    PUSH_SAFETY_SCAN_INTERVAL,
+)
+from custom_components.orcommconnect.entity import OrcommConnectEntity
+
+from .fake_hub import FakeHub
+
+DEVICE_UID = "0001-1"
+
+
+async def _setup(hass: HomeAssistant) -> MockConfigEntry:
+    """Set up an entry for the fake hub."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="127.0.0.1",
+        data={
+            CONF_HOST: "127.0.0.1",
+            CONF_USERNAME: DEFAULT_USERNAME,
+            CONF_PASSWORD: DEFAULT_PASSWORD,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def _push(hass: HomeAssistant, entry: MockConfigEntry, body) -> int:
+    """Post a body to the entry's webhook and return the response status."""
+    request = MockRequest(content=json_bytes(body), mock_source="test", method="POST")
+    response = await webhook.async_handle_webhook(
+        hass, entry.data[CONF_WEBHOOK_ID], request
+    )
+    await hass.async_block_till_done()
+    return response.status
+
+
+def _entity_id(hass: HomeAssistant, unique_id: str) -> str:
+    """Return the entity ID of a light by unique ID."""
+    entity_id = er.async_get(hass).async_get_entity_id("light", DOMAIN, unique_id)
+    assert entity_id is not None
+    return entity_id
+
+
+async def test_push_updates_only_affected_entity(
+    hass: HomeAssistant, fake_hub: FakeHub
+) -> None:
+    """A pushed change updates its entity without a poll and slows polling."""
+    entry = await _setup(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    entity_id = _entity_id(hass, f"1_1_{DEVICE_UID}")
+    assert hass.states.get(entity_id).state == STATE_OFF
+    assert coordinator.update_interval == timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+
+    writes: Counter[str] = Counter()
+    write_ha_state = OrcommConnectEntity.async_write_ha_state
+
+    def count_write(entity: OrcommConnectEntity) -> None:
+        writes[entity.entity_id] += 1
+        write_ha_state(entity)
+
+    requests = fake_hub.requests
+    with patch.object(
+        OrcommConnectEntity, "async_write_ha_state", autospec=True, side_effect=count_write
+    ):
+        status = await _push(
+            hass, entry, {"device_uid": DEVICE_UID, "power_state": True, "brightness": 40}
+        )
+
+    assert status == 200
+    assert fake_hub.requests == requests
+    # The hub still reports the old state, so the new one came from the push
+    assert fake_hub.modules[DEVICE_UID]["power_state"] is False
+    state = hass.states.get(entity_id)
+    assert state.state == STATE_ON
+    assert state.attributes["brightness"] == 102
+    # Only the entities of the pushed module write their state, once each
+    module_entities = {
+        registry_entry.entity_id
+        for registry_entry in er.async_entries_for_config_entry(
+            er.async_get(hass), entry.entry_id
+        )
+        if registry_entry.unique_id.startswith(f"1_1_{DEVICE_UID}")
+    }
+    assert entity_id in module_entities
+    assert writes == dict.fromkeys(module_entities, 1)
+    assert coordinator.update_interval == timedelta(seconds=PUSH_SAFETY_SCAN_INTERVAL)
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"device_uid": DEVICE_UID, "brightness": True},
+        {"device_uid": DEVICE_UID, "brightness": 150},
+        {"power_state": True},
+        {"events": [{"device_uid": DEVICE_UID}, {"power_state": True}]},
+    ],
+)
+async def test_push_rejects_invalid_events(
+    hass: HomeAssistant, fake_hub: FakeHub, body
+) -> None:
+    """Invalid events are rejected without touching any entity."""
+    entry = await _setup(hass)
+    entity_id = _entity_id(hass, f"1_1_{DEVICE_UID}")
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    assert await _push(hass, entry, body) == 400
+    assert hass.states.get(entity_id).state == STATE_OFF
+    assert coordinator.update_interval == timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+
+
+async def test_push_supersedes_unverified_command(
+    hass: HomeAssistant, fake_hub: FakeHub
+) -> None:
+    """Commands after a push are compared with the pushed state."""
+    entry = await _setup(hass)
+    other_id = _entity_id(hass, "2_1_0002-1")
+    entity_id = _entity_id(hass, f"1_1_{DEVICE_UID}")
+
+    # The first command refreshes at once, holding the second one's refresh back
+    for target in (other_id, entity_id):
+        await hass.services.async_call(
+            "light", "turn_on", {"entity_id": target}, blocking=True
+        )
+    assert fake_hub.modules[DEVICE_UID]["power_state"] is True
+
+    # Switched off at the wall before a poll verified the command
+    fake_hub.modules[DEVICE_UID]["power_state"] = False
+    assert await _push(hass, entry, {"device_uid": DEVICE_UID, "power_state": False}) == 200
+    assert hass.states.get(entity_id).state == STATE_OFF
+
+    await hass.services.async_call(
+        "light", "turn_on", {"entity_id": entity_id}, blocking=True
+    )
+    assert fake_hub.modules[DEVICE_UID]["power_state"] is True
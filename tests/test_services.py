@@ -0,0 +1,95 @@
+"""Tests for the Orcomm Connect capture services."""
+from __future__ import annotations
+
+import pytest
+import voluptuous as vol
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import Context, HomeAssistant
+from homeassistant.exceptions import Unauthorized
+from pytest_homeassistant_custom_component.common import MockConfigEntry, MockUser
+
+from custom_components.orcommconnect.const import (
+    DEFAULT_PASSWORD,
+    DEFAULT_USERNAME,
+    DOMAIN,
+    SERVICE_START_CAPTURE,
+    SERVICE_STOP_CAPTURE,
+)
+
+from .fake_hub import FakeHub
+
+
+@pytest.fixture
+async def entry(hass: HomeAssistant, fake_hub: FakeHub) -> MockConfigEntry:
+    """Set up an entry for the fake hub."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="127.0.0.1",
+        data={
+            CONF_HOST: "127.0.0.1",
+            CONF_USERNAME: DEFAULT_USERNAME,
+            CONF_PASSWORD: DEFAULT_PASSWORD,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        "configuration.yaml",
+        "../capture.jsonl",
+        "/tmp/capture.jsonl",
+        "www/capture.jsonl",
+        ".jsonl",
+    ],
+)
+async def test_start_capture_rejects_filename(
+    hass: HomeAssistant, entry: MockConfigEntry, filename: str
+) -> None:
+    """Captures are only written to .jsonl files directly in the config directory."""
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_START_CAPTURE, {"filename": filename}, blocking=True
+        )
+    assert hass.data[DOMAIN][entry.entry_id]["api"]._capture is None
+
+
+async def test_stop_capture_rejects_filename(
+    hass: HomeAssistant, entry: MockConfigEntry
+) -> None:
+    """Stopping a capture takes no file name."""
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_STOP_CAPTURE, {"filename": "capture.jsonl"}, blocking=True
+        )
+
+
+@pytest.mark.parametrize("service", [SERVICE_START_CAPTURE, SERVICE_STOP_CAPTURE])
+async def test_capture_requires_admin(
+    hass: HomeAssistant, entry: MockConfigEntry, hass_read_only_user: MockUser, service: str
+) -> None:
+    """Only administrators can start or stop a capture."""
+    with pytest.raises(Unauthorized):
+        await hass.services.async_call(
+            DOMAIN,
+            service,
+            {},
+            blocking=True,
+            context=Context(user_id=hass_read_only_user.id),
+        )
+    assert hass.data[DOMAIN][entry.entry_id]["api"]._capture is None
+
+
+async def test_start_and_stop_capture(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """A valid file name starts a capture in the config directory."""
+    api = hass.data[DOMAIN][entry.entry_id]["api"]
+    await hass.services.async_call(
+        DOMAIN, SERVICE_START_CAPTURE, {"filename": "capture.jsonl"}, blocking=True
+    )
+    assert api._capture.path == hass.config.path("capture.jsonl")
+    await hass.services.async_call(DOMAIN, SERVICE_STOP_CAPTURE, {}, blocking=True)
+    assert api._capture is None
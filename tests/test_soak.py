@@ -0,0 +1,248 @@
+"""Soak test of the Orcomm Connect integration against a simulated hub.
+
+Every cycle polls the hub, fires a storm of light and switch commands,
+pushes state changes through the webhook and periodically injects stalled
+requests, hub outages and config entry reloads. Memory, live tasks, open
+hub connections and poll latency are sampled after every cycle; the test
+fails if any of them keeps growing once the integration has warmed up.
+
+The soak takes minutes, so it only runs when ``ORCOMM_SOAK_CYCLES`` is set,
+e.g. ``ORCOMM_SOAK_CYCLES=60 pytest tests/test_soak.py``. CI runs it nightly.
+"""
+from __future__ import annotations
+
+import asyncio
+import gc
+import logging
+import os
+import random
+import statistics
+import time
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import async_timeout
+import pytest
+from homeassistant.components import webhook
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    CONF_USERNAME,
+    CONF_WEBHOOK_ID,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.aiohttp import MockRequest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.orcommconnect.const import (
+    CONF_BRIGHTNESS_RATE,
+    DEFAULT_PASSWORD,
+    DEFAULT_USERNAME,
+    DOMAIN,
+)
+
+from .fake_hub import FAULT_ERROR, FAULT_TIMEOUT, FakeHub
+
+pytestmark = pytest.mark.skipif(
+    "ORCOMM_SOAK_CYCLES" not in os.environ, reason="Set ORCOMM_SOAK_CYCLES to run"
+)
+
+CYCLES = int(os.environ.get("ORCOMM_SOAK_CYCLES", "60"))
+STORM_SIZE = 40
+PUSH_SIZE = 20
+TIMEOUT_EVERY = 7
+OUTAGE_EVERY = 11
+RELOAD_EVERY = 10
+# Requests to the hub time out after this many seconds during the soak
+REQUEST_TIMEOUT = 2.0
+
+# Allowed growth between the middle and the last third of the samples
+MEMORY_SLACK = 512 * 1024
+MEMORY_RATIO = 1.05
+TASK_SLACK = 3
+CONNECTION_SLACK = 2
+LATENCY_RATIO = 2.0
+LATENCY_SLACK = 0.05
+
+# Log records kept by pytest's capture handlers are not the integration's
+_MEMORY_FILTERS = [
+    tracemalloc.Filter(False, logging.__file__),
+    tracemalloc.Filter(False, "*/_pytest/*"),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+]
+
+
+def _traced_memory() -> int:
+    """Return the traced memory in bytes, excluding test instrumentation."""
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot().filter_traces(_MEMORY_FILTERS)
+    return sum(stat.size for stat in snapshot.statistics("filename"))
+
+
+def assert_bounded(name: str, samples: list[float], slack: float, ratio: float = 1.0):
+    """Fail if the last third of samples is clearly above the middle third.
+
+    The first third is the warm-up and is ignored. Medians keep a single
+    slow cycle or garbage collection from failing the check.
+    """
+    third = len(samples) // 3
+    baseline = statistics.median(samples[third : 2 * third])
+    final = statistics.median(samples[2 * third :])
+    assert final <= baseline * ratio + slack, (
+        f"{name} kept growing: median {baseline:.3f} over cycles "
+        f"{third}-{2 * third}, {final:.3f} over cycles {2 * third}-{len(samples)}"
+    )
+
+
+async def _storm(hass: HomeAssistant, rng: random.Random, lights, switches) -> None:
+    """Fire a burst of concurrent light and switch commands."""
+    calls = []
+    for _ in range(STORM_SIZE):
+        if rng.random() < 0.6:
+            entity_id = rng.choice(lights)
+            if rng.random() < 0.8:
+                calls.append(
+                    hass.services.async_call(
+                        "light",
+                        "turn_on",
+                        {"entity_id": entity_id, "brightness": rng.randint(1, 255)},
+                        blocking=True,
+                    )
+                )
+            else:
+                calls.append(
+                    hass.services.async_call(
+                        "light", "turn_off", {"entity_id": entity_id}, blocking=True
+                    )
+                )
+        else:
+            service = rng.choice(["turn_on", "turn_off"])
+            calls.append(
+                hass.services.async_call(
+                    "switch",
+                    service,
+                    {"entity_id": rng.choice(switches)},
+                    blocking=True,
+                )
+            )
+    await asyncio.gather(*calls)
+    await hass.async_block_till_done()
+
+
+async def _push(
+    hass: HomeAssistant, webhook_id: str, rng: random.Random, hub: FakeHub
+) -> None:
+    """Push the hub's current state of some modules through the webhook."""
+    uids = rng.sample(sorted(hub.modules), PUSH_SIZE)
+    events = [
+        {
+            "device_uid": uid,
+            "power_state": hub.modules[uid]["power_state"],
+            "brightness": hub.modules[uid]["brightness"],
+        }
+        for uid in uids
+    ]
+    request = MockRequest(
+        content=json_bytes({"events": events}), mock_source="test", method="POST"
+    )
+    response = await webhook.async_handle_webhook(hass, webhook_id, request)
+    assert response.status == 200
+
+
+async def test_soak(hass: HomeAssistant, fake_hub: FakeHub) -> None:
+    """Run the integration through polls, storms, faults and reloads."""
+    rng = random.Random(0)
+    fake_hub.switch_failure_rate = 0.05
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="127.0.0.1",
+        data={
+            CONF_HOST: "127.0.0.1",
+            CONF_USERNAME: DEFAULT_USERNAME,
+            CONF_PASSWORD: DEFAULT_PASSWORD,
+        },
+        # Polls are driven by the test, commands are barely throttled
+        options={CONF_SCAN_INTERVAL: 3600, CONF_BRIGHTNESS_RATE: 30},
+    )
+    entry.add_to_hass(hass)
+
+    short_timeout = SimpleNamespace(
+        timeout=lambda _delay: async_timeout.timeout(REQUEST_TIMEOUT)
+    )
+    memory: list[float] = []
+    tasks: list[float] = []
+    connections: list[float] = []
+    latency: list[float] = []
+
+    # Log records kept by pytest's capture handlers would hold on to every
+    # failed command's exception and frames, so skip creating them
+    logging.disable(logging.ERROR)
+    tracemalloc.start()
+    try:
+        with patch(
+            "custom_components.orcommconnect.async_timeout", short_timeout
+        ), patch("custom_components.orcommconnect.SWITCH_RETRY_BACKOFF", 0.001):
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+
+            registry = er.async_get(hass)
+            registered = er.async_entries_for_config_entry(registry, entry.entry_id)
+            lights = [e.entity_id for e in registered if e.domain == "light"]
+            switches = [e.entity_id for e in registered if e.domain == "switch"]
+            assert lights and switches
+
+            for cycle in range(1, CYCLES + 1):
+                coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+                if cycle % TIMEOUT_EVERY == 0:
+                    fake_hub.set_fault(FAULT_TIMEOUT)
+                elif cycle % OUTAGE_EVERY == 0:
+                    fake_hub.set_fault(FAULT_ERROR)
+
+                start = time.perf_counter()
+                await coordinator.async_refresh()
+                elapsed = time.perf_counter() - start
+
+                if fake_hub.fault is None:
+                    assert coordinator.last_update_success
+                    latency.append(elapsed)
+                else:
+                    assert not coordinator.last_update_success
+                    # Commands during the fault fail and must not pile up
+                    await _storm(hass, rng, lights, switches)
+                    fake_hub.set_fault(None)
+                    await coordinator.async_refresh()
+                    assert coordinator.last_update_success
+
+                await _storm(hass, rng, lights, switches)
+                await _push(hass, entry.data[CONF_WEBHOOK_ID], rng, fake_hub)
+
+                if cycle % RELOAD_EVERY == 0:
+                    assert await hass.config_entries.async_reload(entry.entry_id)
+                    await hass.async_block_till_done()
+
+                memory.append(_traced_memory())
+                tasks.append(len(asyncio.all_tasks()))
+                connections.append(fake_hub.open_connections)
+
+            assert await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+    finally:
+        tracemalloc.stop()
+        logging.disable(logging.NOTSET)
+
+    assert_bounded("Traced memory", memory, MEMORY_SLACK, MEMORY_RATIO)
+    assert_bounded("Live tasks", tasks, TASK_SLACK)
+    assert_bounded("Open hub connections", connections, CONNECTION_SLACK)
+    assert_bounded("Poll latency", latency, LATENCY_SLACK, LATENCY_RATIO)
+
+    leftover = [
+        task
+        for task in asyncio.all_tasks()
+        if "orcommconnect" in repr(task.get_coro())
+    ]
+    assert not leftover